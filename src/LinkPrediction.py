@@ -3,6 +3,7 @@ from abc import abstractmethod
 import networkx as nx
 import numpy as np
 import progressbar
+import scipy.sparse.linalg as spla
 
 class LinkPrediction(ABC):
     def __init__(self, graph):
@@ -117,4 +118,149 @@ class AdamicAdar(LinkPrediction):
             
         bar.finish()
         
-        return scores
\ No newline at end of file
+        return scores
+
+class Katz(LinkPrediction):
+    def __init__(self, graph, beta=None, rank=32, top_k=1000, batch_size=512):
+        """
+        Constructor
+
+        Katz index approximated through a low-rank spectral embedding of the
+        adjacency matrix: with A ~ U diag(lambda) U^T, the Katz matrix
+        sum_{l>=1} beta^l A^l is approximated by
+        U diag(1 / (1 - beta * lambda) - 1) U^T.
+
+        Parameters
+        ----------
+        graph : Networkx graph
+        beta : float, optional
+        attenuation factor, must be lower than 1 / lambda_max
+        (defaults to 0.5 / lambda_max)
+        rank : int
+        number of eigenpairs kept in the embedding
+        top_k : int
+        number of highest scoring non-edges returned by fit
+        batch_size : int
+        number of rows of the score matrix computed at once
+        """
+        super(Katz, self).__init__(graph)
+        if beta is not None and beta <= 0:
+            raise ValueError("beta must be positive")
+        for name, value in (("rank", rank), ("top_k", top_k), ("batch_size", batch_size)):
+            if value < 1:
+                raise ValueError("%s must be at least 1" % name)
+        self.beta = beta
+        self.rank = rank
+        self.top_k = top_k
+        self.batch_size = batch_size
+
+    def embedding(self, A):
+        """
+        Return the low-rank Katz embedding of the adjacency matrix
+
+        Parameters
+        ----------
+        A : scipy sparse matrix
+        adjacency matrix of the graph
+
+        Returns
+        -------
+        U : numpy array of shape (N, rank)
+        eigenvectors of A
+        weights : numpy array of shape (rank,)
+        Katz weight of each eigenvector
+        """
+        if self.rank >= self.N - 1:
+            # eigsh needs rank < N - 1, small graphs are decomposed densely
+            eigenvalues, U = np.linalg.eigh(A.toarray())
+            keep = np.argsort(-np.abs(eigenvalues))[:self.rank]
+            eigenvalues, U = eigenvalues[keep], U[:, keep]
+        else:
+            eigenvalues, U = spla.eigsh(A, k=self.rank, which="LM")
+        lambda_max = eigenvalues.max()
+
+        beta = self.beta if self.beta is not None else 0.5 / lambda_max
+        if beta * lambda_max >= 1:
+            raise ValueError("beta must be lower than 1 / lambda_max = %f" % (1 / lambda_max))
+
+        weights = 1 / (1 - beta * eigenvalues) - 1
+        return U, weights
+
+    def zero_scores(self, nodes):
+        """
+        Return at most top_k non-edges with a zero score
+
+        Parameters
+        ----------
+        nodes : python list
+        node ids, in the order used to orient the pairs
+
+        Returns
+        -------
+        scores : python dict
+        """
+        scores = {}
+        for i, u in enumerate(nodes):
+            for v in nodes[i+1:]:
+                if len(scores) == self.top_k:
+                    return scores
+                if not self.graph.has_edge(u, v):
+                    scores[(u, v)] = 0.0
+        return scores
+
+    def fit(self):
+        if self.graph.is_directed():
+            raise ValueError("Katz requires an undirected graph")
+
+        nodes = list(self.graph.nodes())
+
+        # No spectrum to embed: every non-edge gets a zero score
+        if self.N < 3:
+            return self.zero_scores(nodes)
+        A = nx.to_scipy_sparse_array(self.graph, nodelist=nodes, dtype=float, format="csr")
+        if A.nnz == 0:
+            return self.zero_scores(nodes)
+
+        U, weights = self.embedding(A)
+        UW = U * weights
+
+        best_scores = np.empty(0)
+        best_rows = np.empty(0, dtype=int)
+        best_cols = np.empty(0, dtype=int)
+
+        n_batches = (self.N + self.batch_size - 1) // self.batch_size
+        bar = progressbar.ProgressBar(maxval=n_batches)
+        bar.start()
+        for b, start in enumerate(range(0, self.N, self.batch_size)):
+            stop = min(start + self.batch_size, self.N)
+            scores = UW[start:stop] @ U.T
+
+            # Only keep non-edges (u, v) with u before v in the node ordering
+            rows = np.arange(start, stop)
+            scores[np.arange(self.N)[None, :] <= rows[:, None]] = -np.inf
+            block = A[start:stop].tocoo()
+            scores[block.row, block.col] = -np.inf
+
+            # Merge the best candidates of the batch with the current top-k
+            flat = scores.ravel()
+            k = min(self.top_k, flat.size)
+            idx = np.argpartition(flat, -k)[-k:]
+            idx = idx[np.isfinite(flat[idx])]
+            best_scores = np.concatenate([best_scores, flat[idx]])
+            best_rows = np.concatenate([best_rows, start + idx // self.N])
+            best_cols = np.concatenate([best_cols, idx % self.N])
+            if best_scores.size > self.top_k:
+                keep = np.argpartition(best_scores, -self.top_k)[-self.top_k:]
+                best_scores = best_scores[keep]
+                best_rows = best_rows[keep]
+                best_cols = best_cols[keep]
+            bar.update(b+1)
+
+        bar.finish()
+
+        order = np.argsort(-best_scores)
+        scores = {}
+        for i in order:
+            scores[(nodes[best_rows[i]], nodes[best_cols[i]])] = float(best_scores[i])
+
+        return scores